@@ -21,9 +21,9 @@ bl_info = {
     "category": "Node",
 }
 
-from . import ui, prefs, keymaps
+from . import journal, socket_index, ui, prefs, keymaps
 
-modules = (ui, prefs, keymaps)
+modules = (journal, socket_index, ui, prefs, keymaps)
 
 
 def register():
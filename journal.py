@@ -0,0 +1,379 @@
+import bpy
+from bpy.app.handlers import persistent
+from bpy.props import BoolProperty, CollectionProperty, IntProperty, PointerProperty, StringProperty
+from bpy.types import NodeTree, PropertyGroup
+
+
+class SocketVisibilityJournalEntry(PropertyGroup):
+    node: StringProperty(name="Node")
+    node_type: StringProperty(name="Node Type")
+    socket: StringProperty(name="Socket Identifier")
+    socket_type: StringProperty(name="Socket Type")
+    is_output: BoolProperty(name="Is Output")
+    hide: BoolProperty(name="Hide", description="Visibility state the socket was changed to")
+
+
+class SocketVisibilityCheckpoint(PropertyGroup):
+    # Bitset over the order of the recorded sockets, stored as hex, so it stays valid if the node's sockets change
+    node: StringProperty(name="Node")
+    node_type: StringProperty(name="Node Type")
+    sockets: StringProperty(default="", description="Keys of the sockets whose baseline visibility is known")
+    hidden: StringProperty(default="0", description="Baseline visibility of the recorded sockets")
+
+
+class SocketVisibilityJournal(PropertyGroup):
+    entries: CollectionProperty(type=SocketVisibilityJournalEntry)
+    checkpoint: CollectionProperty(type=SocketVisibilityCheckpoint)
+    compacted: IntProperty(default=0, description="Number of entries folded into the checkpoint")
+
+
+def fetch_journal(node_tree):
+    return node_tree.socket_visibility_journal
+
+
+def find_socket(node, identifier, is_output):
+    sockets = node.outputs if is_output else node.inputs
+
+    for socket in sockets:
+        if socket.identifier == identifier:
+            return socket
+    return None
+
+
+def resolve_socket(node_tree, node_name, node_type, identifier, socket_type, is_output):
+    # Names are reused, so a node or socket of a different type than recorded isn't the one the change was made to
+    node = node_tree.nodes.get(node_name)
+    if node is None or node.bl_idname != node_type:
+        return None, None
+
+    socket = find_socket(node, identifier, is_output)
+    if socket is None or socket.type != socket_type:
+        return node, None
+
+    return node, socket
+
+
+def resolve_entry(node_tree, entry):
+    return resolve_socket(node_tree, entry.node, entry.node_type, entry.socket, entry.socket_type, entry.is_output)
+
+
+def socket_key(identifier, is_output):
+    return f"{'OUT' if is_output else 'IN'}:{identifier}"
+
+
+def checkpoint_key(identifier, socket_type, is_output):
+    return f"{'OUT' if is_output else 'IN'}:{socket_type}:{identifier}"
+
+
+def split_checkpoint_key(key):
+    direction, socket_type, identifier = key.split(":", 2)
+    return identifier, socket_type, direction == "OUT"
+
+
+def record_change(node_tree, node, socket, limit):
+    journal = fetch_journal(node_tree)
+    entries = journal.entries
+
+    if len(entries) > 0:
+        last = entries[-1]
+        is_same_socket = (last.node, last.node_type, last.socket, last.is_output) == (
+            node.name,
+            node.bl_idname,
+            socket.identifier,
+            socket.is_output,
+        )
+
+        # Only cancels out if the socket is back to how it was before the last entry,
+        # as it may also have been changed in between by something that isn't journaled
+        if is_same_socket and socket.hide != last.hide:
+            entries.remove(len(entries) - 1)
+            return
+
+    entry = entries.add()
+    entry.node = node.name
+    entry.node_type = node.bl_idname
+    entry.socket = socket.identifier
+    entry.socket_type = socket.type
+    entry.is_output = socket.is_output
+    entry.hide = socket.hide
+
+    if limit is not None:
+        enforce_limit(node_tree, limit)
+
+
+def set_socket_hide(node_tree, node, socket, hide, limit):
+    if socket.hide == hide:
+        return False
+
+    socket.hide = hide
+    record_change(node_tree, node, socket, limit)
+    update_watched_socket(node_tree, node, socket)
+    return True
+
+
+def enforce_limit(node_tree, limit):
+    entries = fetch_journal(node_tree).entries
+
+    if len(entries) > limit:
+        compact_journal(node_tree, len(entries) - limit)
+
+
+def compact_journal(node_tree, count):
+    journal = fetch_journal(node_tree)
+    entries = journal.entries
+    count = min(count, len(entries))
+
+    # Entries of nodes that no longer exist are folded in as well, in case the node comes back (e.g. re-linked)
+    for entry in entries[:count]:
+        name = f"{entry.node_type}:{entry.node}"
+        record = journal.checkpoint.get(name)
+        if record is None:
+            record = journal.checkpoint.add()
+            record.name = name
+            record.node = entry.node
+            record.node_type = entry.node_type
+
+        key = checkpoint_key(entry.socket, entry.socket_type, entry.is_output)
+        sockets = record.sockets.split("\n") if record.sockets else []
+
+        # Only the first change of a socket holds its baseline, later ones are already superseded
+        if key not in sockets:
+            if not entry.hide:
+                record.hidden = f"{int(record.hidden, 16) | 1 << len(sockets):x}"
+            record.sockets = "\n".join((*sockets, key))
+
+    for _ in range(count):
+        entries.remove(0)
+
+    journal.compacted += count
+
+
+def snapshot_entries(node_tree, start, end):
+    entries = fetch_journal(node_tree).entries
+    return [
+        (entry.node, entry.node_type, entry.socket, entry.socket_type, entry.is_output, entry.hide)
+        for entry in entries[start:end]
+    ]
+
+
+def apply_snapshot(node_tree, snapshot, limit, revert=False):
+    changed = 0
+
+    for node_name, node_type, identifier, socket_type, is_output, hide in snapshot:
+        node, socket = resolve_socket(node_tree, node_name, node_type, identifier, socket_type, is_output)
+        if socket is None:
+            continue
+
+        changed += set_socket_hide(node_tree, node, socket, (not hide) if revert else hide, limit)
+    return changed
+
+
+def revert_entries(node_tree, start, end, limit):
+    snapshot = snapshot_entries(node_tree, start, end)
+    return apply_snapshot(node_tree, reversed(snapshot), limit, revert=True)
+
+
+def replay_entries(node_tree, start, end, limit):
+    snapshot = snapshot_entries(node_tree, start, end)
+    return apply_snapshot(node_tree, snapshot, limit)
+
+
+def restore_checkpoint(node_tree, limit):
+    journal = fetch_journal(node_tree)
+    checkpoint = [
+        (record.node, record.node_type, record.sockets, int(record.hidden, 16)) for record in journal.checkpoint
+    ]
+    snapshot = snapshot_entries(node_tree, 0, len(journal.entries))
+
+    # Compaction is held off until the end, as it would modify the checkpoint that is being restored
+    changed = apply_snapshot(node_tree, reversed(snapshot), None, revert=True)
+
+    for node_name, node_type, sockets, hidden in checkpoint:
+        if not sockets:
+            continue
+
+        for index, key in enumerate(sockets.split("\n")):
+            identifier, socket_type, is_output = split_checkpoint_key(key)
+            node, socket = resolve_socket(node_tree, node_name, node_type, identifier, socket_type, is_output)
+            if socket is not None:
+                changed += set_socket_hide(node_tree, node, socket, bool(hidden >> index & 1), None)
+
+    enforce_limit(node_tree, limit)
+    return changed
+
+
+def count_missing_checkpoint_nodes(node_tree):
+    journal = fetch_journal(node_tree)
+    missing = 0
+
+    for record in journal.checkpoint:
+        node = node_tree.nodes.get(record.node)
+        missing += node is None or node.bl_idname != record.node_type
+    return missing
+
+
+# Last seen visibility of the node drawn by the panel/pop-up, per tree pointer: (node name, owner pointer, states)
+watched_nodes = {}
+msgbus_owner = object()
+
+
+def hide_states(node):
+    return {socket_key(socket.identifier, socket.is_output): socket.hide for socket in (*node.inputs, *node.outputs)}
+
+
+def watch_node(node, owner=None):
+    node_tree = node.id_data
+    watched = watched_nodes.get(node_tree.as_pointer())
+
+    # Only the drawn node is watched, switching to another one evicts the previous
+    if watched is None or watched[0] != node.name:
+        owner_pointer = node_tree.as_pointer() if owner is None else owner.as_pointer()
+        watched_nodes[node_tree.as_pointer()] = (node.name, owner_pointer, hide_states(node))
+
+
+def update_watched_socket(node_tree, node, socket):
+    watched = watched_nodes.get(node_tree.as_pointer())
+    if watched is not None and watched[0] == node.name:
+        watched[2][socket_key(socket.identifier, socket.is_output)] = socket.hide
+
+
+def iter_editor_trees(context):
+    seen = set()
+
+    for window in context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type != "NODE_EDITOR":
+                continue
+
+            node_tree = area.spaces.active.edit_tree
+            if node_tree is not None and node_tree.as_pointer() not in seen:
+                seen.add(node_tree.as_pointer())
+                yield node_tree
+
+
+def record_watched_changes(tree_pointers=None):
+    if not watched_nodes:
+        return
+
+    context = bpy.context
+    limit = context.preferences.addons[__package__].preferences.journal_limit
+    editor_trees = set()
+
+    for node_tree in iter_editor_trees(context):
+        pointer = node_tree.as_pointer()
+        editor_trees.add(pointer)
+
+        watched = watched_nodes.get(pointer)
+        if watched is None or (tree_pointers is not None and pointer not in tree_pointers):
+            continue
+
+        node_name, _, states = watched
+        node = node_tree.nodes.get(node_name)
+        if node is None:
+            del watched_nodes[pointer]
+            continue
+
+        for socket in (*node.inputs, *node.outputs):
+            key = socket_key(socket.identifier, socket.is_output)
+            previous = states.get(key)
+            states[key] = socket.hide
+
+            if previous is not None and previous != socket.hide:
+                record_change(node_tree, node, socket, limit)
+
+    # Trees that are no longer open in any node editor can't be drawn, so there is nothing left to watch
+    for pointer in watched_nodes.keys() - editor_trees:
+        del watched_nodes[pointer]
+
+
+def iter_socket_classes():
+    # msgbus matches the concrete struct of the changed socket, so the abstract NodeSocket can't be subscribed to
+    for name in dir(bpy.types):
+        if not name.startswith("NodeSocket"):
+            continue
+
+        cls = getattr(bpy.types, name)
+        if isinstance(cls, type) and issubclass(cls, bpy.types.NodeSocket) and cls is not bpy.types.NodeSocket:
+            yield cls
+
+
+def subscribe_socket_hide():
+    for cls in iter_socket_classes():
+        bpy.msgbus.subscribe_rna(
+            key=(cls, "hide"),
+            owner=msgbus_owner,
+            args=(),
+            notify=record_watched_changes,
+        )
+
+
+@persistent
+def journal_depsgraph_update(scene, depsgraph):
+    if not watched_nodes:
+        return
+
+    # Embedded trees may be reported through their owner, so both pointers are checked
+    updated = {update.id.original.as_pointer() for update in depsgraph.updates}
+    tree_pointers = {
+        pointer for pointer, (_, owner, _) in watched_nodes.items() if pointer in updated or owner in updated
+    }
+
+    if tree_pointers:
+        record_watched_changes(tree_pointers)
+
+
+@persistent
+def journal_undo_redo(*args):
+    watched_nodes.clear()
+
+
+@persistent
+def journal_load_post(*args):
+    watched_nodes.clear()
+    subscribe_socket_hide()
+
+
+handlers = (
+    (bpy.app.handlers.depsgraph_update_post, journal_depsgraph_update),
+    (bpy.app.handlers.undo_post, journal_undo_redo),
+    (bpy.app.handlers.redo_post, journal_undo_redo),
+    (bpy.app.handlers.load_post, journal_load_post),
+)
+
+
+def clear_journal(node_tree):
+    journal = fetch_journal(node_tree)
+    journal.entries.clear()
+    journal.checkpoint.clear()
+    journal.compacted = 0
+
+
+classes = (
+    SocketVisibilityJournalEntry,
+    SocketVisibilityCheckpoint,
+    SocketVisibilityJournal,
+)
+
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+    NodeTree.socket_visibility_journal = PointerProperty(type=SocketVisibilityJournal)
+
+    for handler_list, handler in handlers:
+        handler_list.append(handler)
+    subscribe_socket_hide()
+
+
+def unregister():
+    bpy.msgbus.clear_by_owner(msgbus_owner)
+    for handler_list, handler in handlers:
+        if handler in handler_list:
+            handler_list.remove(handler)
+    watched_nodes.clear()
+
+    del NodeTree.socket_visibility_journal
+
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
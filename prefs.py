@@ -2,16 +2,21 @@ import bpy
 from bpy.props import EnumProperty, IntProperty, StringProperty
 from bpy.types import AddonPreferences
 
-from .ui import NODE_PT_TOGGLE_NODE_SOCKETS
+from .ui import NODE_PT_TOGGLE_NODE_SOCKETS, NODE_PT_SOCKET_VISIBILITY_JOURNAL
 from .keymaps import keymap_layout
 
 
+panels = (NODE_PT_TOGGLE_NODE_SOCKETS, NODE_PT_SOCKET_VISIBILITY_JOURNAL)
+
+
 def panel_category_callback(self, context):
-    NODE_PT_TOGGLE_NODE_SOCKETS.bl_category = self.panel_location
-    if hasattr(bpy.types, "NODE_PT_TOGGLE_NODE_SOCKETS"):
-        bpy.utils.unregister_class(NODE_PT_TOGGLE_NODE_SOCKETS)
+    for panel in reversed(panels):
+        panel.bl_category = self.panel_location
+        if hasattr(bpy.types, panel.__name__):
+            bpy.utils.unregister_class(panel)
 
-    bpy.utils.register_class(NODE_PT_TOGGLE_NODE_SOCKETS)
+    for panel in panels:
+        bpy.utils.register_class(panel)
 
 
 class NodeToggleSocketVisibilityPrefs(AddonPreferences):
@@ -44,6 +49,22 @@ class NodeToggleSocketVisibilityPrefs(AddonPreferences):
         description="Specifies the width of the pop-up panel",
     )
 
+    journal_limit: IntProperty(
+        name="Journal Limit",
+        default=256,
+        min=1,
+        soft_max=4096,
+        description="Maximum number of visibility changes kept per node tree before older ones are compacted into a checkpoint",
+    )
+
+    journal_display_count: IntProperty(
+        name="Journal Display Count",
+        default=10,
+        min=1,
+        soft_max=50,
+        description="Specifies how many of the most recent visibility changes are listed in the journal panel",
+    )
+
     def draw(self, context):
         layout = self.layout
 
@@ -67,6 +88,13 @@ class NodeToggleSocketVisibilityPrefs(AddonPreferences):
         popup_settings.separator(factor=0.25)
         popup_settings.prop(self, "popup_width", text="Width")
 
+        journal_settings = col1.box().column()
+        journal_settings.use_property_split = True
+        journal_settings.label(text="Journal Settings:")
+        journal_settings.separator(factor=0.25)
+        journal_settings.prop(self, "journal_limit", text="Limit")
+        journal_settings.prop(self, "journal_display_count", text="Display Count")
+
         keymap_layout.draw_keyboard_shorcuts(self, layout, context)
 
 
@@ -0,0 +1,220 @@
+import bpy
+from bpy.app.handlers import persistent
+from bpy.types import NodeSocketVirtual
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+
+from . import journal
+
+
+# Collections in bpy.data whose items either are node trees or own an embedded one
+TREE_OWNERS = ("node_groups", "materials", "worlds", "lights", "textures", "linestyles", "scenes")
+
+
+@dataclass(frozen=True)
+class SocketRecord:
+    node: str
+    node_type: str
+    identifier: str
+    is_output: bool
+    socket_type: str
+
+
+def iter_node_trees():
+    for collection_name in TREE_OWNERS:
+        collection = getattr(bpy.data, collection_name, None)
+        if collection is None:
+            continue
+
+        for owner in collection:
+            if owner.library is not None:
+                continue
+
+            if collection_name == "node_groups":
+                node_tree = owner
+            else:
+                node_tree = getattr(owner, "node_tree", None)
+
+            if node_tree is not None:
+                yield (collection_name, owner.name), owner, node_tree
+
+
+def resolve_tree(key):
+    collection_name, name = key
+    owner = getattr(bpy.data, collection_name).get(name)
+
+    if owner is None or collection_name == "node_groups":
+        return owner
+    return getattr(owner, "node_tree", None)
+
+
+def fetch_socket_name(socket):
+    return (socket.label or socket.name).lower()
+
+
+def is_toggleable(node, socket):
+    return (
+        socket.enabled
+        and not socket.is_linked
+        and not isinstance(socket, NodeSocketVirtual)
+        and node.bl_idname != "NodeReroute"
+    )
+
+
+# Maps socket names to the sockets carrying them across every node tree in the file.
+# Trees are only re-indexed when a depsgraph update touched them, their node count changed, they were added/renamed,
+# or a query ran into a record that no longer matches the tree.
+class SocketIndex:
+    def __init__(self):
+        self.tree_records = {}
+        self.by_name = {}
+        self.node_counts = {}
+        self.pointers = {}
+        self.dirty = set()
+
+    def clear(self):
+        self.tree_records.clear()
+        self.by_name.clear()
+        self.node_counts.clear()
+        self.pointers.clear()
+        self.dirty.clear()
+
+    def mark_dirty(self, id_data):
+        key = self.pointers.get(id_data.original.as_pointer())
+        if key is not None:
+            self.dirty.add(key)
+
+    def remove_tree(self, key):
+        self.node_counts.pop(key, None)
+
+        for name in self.tree_records.pop(key, ()):
+            trees = self.by_name[name]
+            del trees[key]
+            if not trees:
+                del self.by_name[name]
+
+    def add_tree(self, key, node_tree):
+        records = {}
+
+        for node in node_tree.nodes:
+            if node.bl_idname == "NodeReroute":
+                continue
+
+            for socket in (*node.inputs, *node.outputs):
+                if isinstance(socket, NodeSocketVirtual):
+                    continue
+
+                record = SocketRecord(node.name, node.bl_idname, socket.identifier, socket.is_output, socket.type)
+                name = fetch_socket_name(socket)
+                records.setdefault(name, []).append(record)
+
+        self.tree_records[key] = records
+        self.node_counts[key] = len(node_tree.nodes)
+        for name, name_records in records.items():
+            self.by_name.setdefault(name, {})[key] = name_records
+
+    def refresh(self):
+        current = {}
+        self.pointers.clear()
+
+        # Embedded trees may be reported through their owner in depsgraph updates, so both are tracked
+        for key, owner, node_tree in iter_node_trees():
+            current[key] = node_tree
+            self.pointers[owner.as_pointer()] = key
+            self.pointers[node_tree.as_pointer()] = key
+
+        for key in self.tree_records.keys() - current.keys():
+            self.remove_tree(key)
+
+        # Unused trees never show up in the depsgraph, their node count is a cheap hint that they were edited
+        for key, node_tree in current.items():
+            if key in self.dirty or self.node_counts.get(key) != len(node_tree.nodes):
+                self.remove_tree(key)
+                self.add_tree(key, node_tree)
+
+        self.dirty.clear()
+
+    def query(self, pattern, node_type="", socket_type="ANY", direction="BOTH"):
+        # An empty pattern matches nothing, rather than every socket in the file
+        if not pattern:
+            return {}
+
+        self.refresh()
+
+        pattern = pattern.lower()
+        node_type = node_type.lower()
+        matches = {}
+
+        for name, trees in self.by_name.items():
+            if not fnmatchcase(name, pattern):
+                continue
+
+            for key, records in trees.items():
+                for record in records:
+                    if node_type and not fnmatchcase(record.node_type.lower(), node_type):
+                        continue
+                    if socket_type != "ANY" and record.socket_type != socket_type:
+                        continue
+                    if direction != "BOTH" and record.is_output != (direction == "OUTPUTS"):
+                        continue
+
+                    matches.setdefault(key, []).append(record)
+        return matches
+
+
+index = SocketIndex()
+
+
+def iter_matching_sockets(matches, pattern):
+    pattern = pattern.lower()
+
+    for key, records in matches.items():
+        node_tree = resolve_tree(key)
+        if node_tree is None:
+            continue
+
+        for record in records:
+            node, socket = journal.resolve_socket(
+                node_tree, record.node, record.node_type, record.identifier, record.socket_type, record.is_output
+            )
+
+            # A record that no longer matches means the tree was edited without the index noticing
+            if socket is None or not fnmatchcase(fetch_socket_name(socket), pattern):
+                index.dirty.add(key)
+                continue
+
+            if is_toggleable(node, socket):
+                yield node_tree, node, socket
+
+
+@persistent
+def index_depsgraph_update(scene, depsgraph):
+    for update in depsgraph.updates:
+        index.mark_dirty(update.id)
+
+
+@persistent
+def index_clear(*args):
+    # Undo/redo can restore trees and reallocate their IDs without any depsgraph update
+    index.clear()
+
+
+handlers = (
+    (bpy.app.handlers.depsgraph_update_post, index_depsgraph_update),
+    (bpy.app.handlers.undo_post, index_clear),
+    (bpy.app.handlers.redo_post, index_clear),
+    (bpy.app.handlers.load_post, index_clear),
+)
+
+
+def register():
+    for handler_list, handler in handlers:
+        handler_list.append(handler)
+
+
+def unregister():
+    for handler_list, handler in handlers:
+        if handler in handler_list:
+            handler_list.remove(handler)
+
+    index.clear()
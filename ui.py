@@ -1,6 +1,9 @@
 import bpy
+from bpy.props import BoolProperty, EnumProperty, IntProperty, StringProperty
 from bpy.types import NodeSocketVirtual, Operator, Panel
 
+from . import journal, socket_index
+
 
 def fetch_user_preferences(attr_id=None):
     prefs = bpy.context.preferences.addons[__package__].preferences
@@ -21,6 +24,13 @@ def fetch_active_nodetree(context):
         return node_tree
 
 
+def socket_name(socket):
+    if socket.label == "":
+        return socket.name
+    else:
+        return socket.label
+
+
 def nice_name(node):
     if hasattr(node, "node_tree"):
         return f"{node.bl_label} ({node.node_tree.name})"
@@ -34,6 +44,8 @@ class SocketDrawingBaseclass:
         if len(sockets) <= 0:
             return
 
+        journal.watch_node(node, owner=getattr(bpy.context.space_data, "id", None))
+
         layout = layout.box().row(align=True)
         col1 = layout.column(align=True)
         col1.alignment = "RIGHT"
@@ -44,10 +56,7 @@ class SocketDrawingBaseclass:
             if not inp.enabled or isinstance(inp, NodeSocketVirtual):
                 continue
 
-            if inp.label == "":
-                name = inp.name
-            else:
-                name = inp.label
+            name = socket_name(inp)
 
             if inp.is_linked:
                 col1.label(text="", icon="DECORATE_LINKED")
@@ -82,6 +91,8 @@ class NODE_PT_TOGGLE_NODE_SOCKETS(Panel, SocketDrawingBaseclass):
         node_tree = fetch_active_nodetree(context)
         node = node_tree.nodes.active
 
+        layout.operator(NODE_OT_FIND_TOGGLE_SOCKETS.bl_idname, icon="VIEWZOOM")
+
         if (node is None) or (node not in context.selected_nodes):
             layout.label(text="No node currently selected.")
             return
@@ -120,6 +131,238 @@ class NODE_PT_TOGGLE_NODE_SOCKETS(Panel, SocketDrawingBaseclass):
                 sublayout.label(text="No inputs/outputs found.", icon="PANEL_CLOSE")
 
 
+class NODE_PT_SOCKET_VISIBILITY_JOURNAL(Panel):
+    bl_label = "Journal"
+    bl_space_type = "NODE_EDITOR"
+    bl_region_type = "UI"
+    bl_category = "View"
+    bl_parent_id = "NODE_PT_TOGGLE_NODE_SOCKETS"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        layout = self.layout
+        node_tree = fetch_active_nodetree(context)
+        socket_journal = journal.fetch_journal(node_tree)
+        entries = socket_journal.entries
+
+        row = layout.row(align=True)
+        props = row.operator(NODE_OT_SOCKET_VISIBILITY_JOURNAL.bl_idname, text="Revert All", icon="LOOP_BACK")
+        props.action = "REVERT"
+        props.start, props.end = 1, len(entries)
+        props = row.operator(NODE_OT_SOCKET_VISIBILITY_JOURNAL.bl_idname, text="Range", icon="PREVIEW_RANGE")
+        props.use_dialog = True
+        props = row.operator(NODE_OT_SOCKET_VISIBILITY_JOURNAL.bl_idname, text="Checkpoint", icon="RECOVER_LAST")
+        props.action = "CHECKPOINT"
+        props = row.operator(NODE_OT_SOCKET_VISIBILITY_JOURNAL.bl_idname, text="", icon="TRASH")
+        props.action = "CLEAR"
+
+        if socket_journal.compacted > 0:
+            layout.label(text=f"{socket_journal.compacted} older change(s) compacted", icon="INFO")
+
+        missing = journal.count_missing_checkpoint_nodes(node_tree)
+        if missing > 0:
+            layout.label(text=f"{missing} checkpoint node(s) not found, they won't be restored", icon="ERROR")
+
+        if len(entries) <= 0:
+            layout.label(text="No visibility changes recorded.")
+            return
+
+        col = layout.box().column(align=True)
+        shown_entries = fetch_user_preferences("journal_display_count")
+
+        for index in reversed(range(max(0, len(entries) - shown_entries), len(entries))):
+            entry = entries[index]
+            node, socket = journal.resolve_entry(node_tree, entry)
+            name = entry.socket if socket is None else socket_name(socket)
+            number = index + 1
+
+            row = col.row(align=True)
+            row.active = socket is not None
+            row.label(text=f"{number}. {entry.node}: {name}", icon="HIDE_ON" if entry.hide else "HIDE_OFF")
+
+            props = row.operator(NODE_OT_SOCKET_VISIBILITY_JOURNAL.bl_idname, text="", icon="LOOP_BACK", emboss=False)
+            props.action = "REVERT"
+            props.start, props.end = number, len(entries)
+            props = row.operator(NODE_OT_SOCKET_VISIBILITY_JOURNAL.bl_idname, text="", icon="LOOP_FORWARDS", emboss=False)
+            props.action = "REPLAY"
+            props.start, props.end = number, len(entries)
+
+
+class NODE_OT_SOCKET_VISIBILITY_JOURNAL(Operator):
+    bl_label = "Socket Visibility Journal"
+    bl_idname = "node.socket_visibility_journal"
+    bl_description = "Reverts or replays recorded socket visibility changes of the active node tree"
+    bl_options = {"REGISTER", "UNDO", "INTERNAL"}
+
+    action: EnumProperty(
+        items=(
+            ("REVERT", "Revert", "Undo the visibility changes in the given range"),
+            ("REPLAY", "Replay", "Re-apply the visibility changes in the given range"),
+            ("CHECKPOINT", "Restore Checkpoint", "Restore visibility to how it was before any recorded change"),
+            ("CLEAR", "Clear", "Discard all recorded visibility changes"),
+        ),
+        default="REVERT",
+    )
+    start: IntProperty(name="From", min=1, default=1, description="Number of the first change in the range")
+    end: IntProperty(name="To", min=1, default=1, description="Number of the last change in the range")
+    use_dialog: BoolProperty(options={"HIDDEN", "SKIP_SAVE"})
+
+    @classmethod
+    def description(cls, context, properties):
+        if properties.use_dialog:
+            return "Reverts or replays a chosen range of recorded socket visibility changes"
+
+        description = cls.bl_rna.properties["action"].enum_items[properties.action].description
+        if properties.action in {"REVERT", "REPLAY"} and properties.start != properties.end:
+            return f"{description}, from change {properties.start} to {properties.end}"
+        return description
+
+    @classmethod
+    def poll(cls, context):
+        return fetch_active_nodetree(context) is not None
+
+    def execute(self, context):
+        node_tree = fetch_active_nodetree(context)
+        limit = fetch_user_preferences("journal_limit")
+
+        # The range is shown 1-based and inclusive, the journal works on slices
+        start, end = self.start - 1, self.end
+
+        if self.action == "REVERT":
+            journal.revert_entries(node_tree, start, end, limit)
+        elif self.action == "REPLAY":
+            journal.replay_entries(node_tree, start, end, limit)
+        elif self.action == "CHECKPOINT":
+            journal.restore_checkpoint(node_tree, limit)
+        else:
+            journal.clear_journal(node_tree)
+
+        return {"FINISHED"}
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+
+        layout.prop(self, "action")
+        if self.action in {"REVERT", "REPLAY"}:
+            col = layout.column(align=True)
+            col.prop(self, "start")
+            col.prop(self, "end")
+
+    def invoke(self, context, event):
+        if not self.use_dialog:
+            return self.execute(context)
+
+        entries = journal.fetch_journal(fetch_active_nodetree(context)).entries
+        self.action = "REVERT"
+        self.start, self.end = 1, max(1, len(entries))
+        return context.window_manager.invoke_props_dialog(self)
+
+
+def socket_type_items(self, context):
+    items = [("ANY", "Any", "Match sockets of any type")]
+    for item in bpy.types.NodeSocket.bl_rna.properties["type"].enum_items:
+        items.append((item.identifier, item.name, item.description))
+
+    # Blender requires a reference to dynamic enum items to be kept around
+    socket_type_items.cache = items
+    return items
+
+
+class NODE_OT_FIND_TOGGLE_SOCKETS(Operator):
+    bl_label = "Find & Toggle Sockets"
+    bl_idname = "node.find_toggle_sockets"
+    bl_description = "Hides or shows every socket matching a name pattern across all node trees in the file"
+    bl_options = {"REGISTER", "UNDO"}
+
+    # Filters and result of the last preview, so the dialog doesn't query the index on every redraw
+    preview = None
+
+    pattern: StringProperty(
+        name="Name",
+        description="Socket name to match (case-insensitive, supports * and ? wildcards)",
+    )
+    node_type: StringProperty(
+        name="Node Type",
+        description="Only match sockets of nodes whose type identifier matches this pattern, e.g. ShaderNodeMix",
+    )
+    socket_type: EnumProperty(
+        name="Socket Type",
+        items=socket_type_items,
+        description="Only match sockets of this data type",
+    )
+    direction: EnumProperty(
+        name="Direction",
+        items=(
+            ("BOTH", "Both", "Match inputs and outputs"),
+            ("INPUTS", "Inputs", "Only match inputs"),
+            ("OUTPUTS", "Outputs", "Only match outputs"),
+        ),
+        default="BOTH",
+    )
+    action: EnumProperty(
+        name="Action",
+        items=(
+            ("HIDE", "Hide", "Hide the matching sockets"),
+            ("SHOW", "Show", "Show the matching sockets"),
+        ),
+        default="HIDE",
+    )
+
+    def matching_sockets(self):
+        matches = socket_index.index.query(self.pattern, self.node_type, self.socket_type, self.direction)
+        hide = self.action == "HIDE"
+
+        for node_tree, node, socket in socket_index.iter_matching_sockets(matches, self.pattern):
+            if socket.hide != hide:
+                yield node_tree, node, socket
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+
+        layout.prop(self, "pattern")
+        layout.prop(self, "node_type")
+        layout.prop(self, "socket_type")
+        layout.prop(self, "direction")
+        layout.prop(self, "action")
+
+        filters = (self.pattern, self.node_type, self.socket_type, self.direction, self.action)
+        preview = NODE_OT_FIND_TOGGLE_SOCKETS.preview
+
+        if preview is None or preview[0] != filters:
+            trees = set()
+            count = 0
+            for node_tree, node, socket in self.matching_sockets():
+                trees.add(node_tree.as_pointer())
+                count += 1
+
+            preview = NODE_OT_FIND_TOGGLE_SOCKETS.preview = (filters, count, len(trees))
+
+        _, count, tree_count = preview
+        verb = "hidden" if self.action == "HIDE" else "shown"
+        layout.label(text=f"{count} socket(s) in {tree_count} node tree(s) will be {verb}.", icon="INFO")
+
+    def execute(self, context):
+        hide = self.action == "HIDE"
+        limit = fetch_user_preferences("journal_limit")
+
+        changes = list(self.matching_sockets())
+        for node_tree, node, socket in changes:
+            journal.set_socket_hide(node_tree, node, socket, hide, limit)
+
+        # Otherwise the redo panel would keep showing the count from before the sockets were toggled
+        NODE_OT_FIND_TOGGLE_SOCKETS.preview = None
+
+        verb = "Hid" if hide else "Showed"
+        self.report({"INFO"}, f"{verb} {len(changes)} socket(s)")
+        return {"FINISHED"}
+
+    def invoke(self, context, event):
+        NODE_OT_FIND_TOGGLE_SOCKETS.preview = None
+        return context.window_manager.invoke_props_dialog(self, width=fetch_user_preferences("popup_width") * 2)
+
+
 class NODE_OT_CALL_SOCKET_VISIBILITY_POPUP(Operator, SocketDrawingBaseclass):
     bl_label = "Call Socket Visibility Pop-up"
     bl_idname = "node.call_socket_visibility_popup"
@@ -177,6 +420,9 @@ class NODE_OT_CALL_SOCKET_VISIBILITY_POPUP(Operator, SocketDrawingBaseclass):
 
 classes = (
     NODE_PT_TOGGLE_NODE_SOCKETS,
+    NODE_PT_SOCKET_VISIBILITY_JOURNAL,
+    NODE_OT_SOCKET_VISIBILITY_JOURNAL,
+    NODE_OT_FIND_TOGGLE_SOCKETS,
     NODE_OT_CALL_SOCKET_VISIBILITY_POPUP,
 )
 